@@ -1,14 +1,137 @@
 import secrets
 import string
 import re
+import os
+import time
+import tempfile
+import hashlib
+import functools
+import itertools
+import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# re2 matches all excluded words in a single linear-time pass. If it is not installed, re is used instead.
+try:
+	import re2
+except ImportError:
+	re2 = re
 
-from nltk.corpus import wordnet
 from pyhibp import pwnedpasswords as pw
 from pyhibp import set_user_agent
 
-from settings import EXCLUDED_WORDS, USABLE_CHARS, EXCLUDED_CHARS, MAX_PASS_LEN, MIN_PASS_LEN, FIXED_LEN, PSWRD_NO
+from settings import EXCLUDED_WORDS, USABLE_CHARS, EXCLUDED_CHARS, MAX_PASS_LEN, MIN_PASS_LEN, FIXED_LEN, PSWRD_NO, \
+	HIBP_CACHE_DIR, HIBP_CACHE_DAYS
 from language import Language
 
+# The user agent is set once for all requests made by pyhibp.
+set_user_agent(ua="PyPass Python password generator. Demo version.")
+
+# Maximum number of threads making requests to 'https://haveibeenpwned.com/Passwords' at the same time.
+_MAX_WORKERS = 16
+
+# Letter sequence patterns are compiled once, instead of on every call to the methods using them.
+# Patterns are bytes, as passwords are handled as a bytearray of ASCII chars until they are complete.
+_LETTER_RUN_2 = re.compile(rb'[a-zA-Z]{2,}')
+_LETTER_RUN_1 = re.compile(rb'[a-zA-Z]+')
+
+
+@functools.lru_cache(maxsize=None)
+def _english_words():
+	"""
+	Returns all WordNet lemma names, so checking if a letter sequence is an English word is a set lookup.
+	WordNet is loaded on the first call, so that generating passwords which keep English words never loads it.
+	"""
+	from nltk.corpus import wordnet
+
+	return frozenset(w.lower() for w in wordnet.words())
+
+
+@functools.lru_cache(maxsize=4096)
+def _breached_suffixes(hash_prefix):
+	"""
+	Fetches suffixes of all breached password SHA-1 hashes starting with hash_prefix, from 'https://haveibeenpwned.com/Passwords'.
+	Uses the k-anonymity range search, so only the first 5 chars of a password hash are ever sent.
+	Results are kept in memory and, if HIBP_CACHE_DIR is set in settings.py, saved there to be reused for
+	HIBP_CACHE_DAYS days.
+
+	Args:
+		hash_prefix (str): First 5 chars of an upper case SHA-1 hex digest.
+	"""
+	cache_file = os.path.join(HIBP_CACHE_DIR, hash_prefix + '.txt') if HIBP_CACHE_DIR else None
+
+	# Any error from the cache only makes it fall back to the range search, and never stops password generation.
+	if cache_file:
+		try:
+			if time.time() - os.path.getmtime(cache_file) < HIBP_CACHE_DAYS * 86400:
+				with open(cache_file, 'r') as f:
+					return frozenset(f.read().split())
+		except OSError:
+			pass
+
+	suffixes = frozenset(line.split(':')[0] for line in pw.suffix_search(hash_prefix=hash_prefix))
+
+	if cache_file:
+		try:
+			os.makedirs(HIBP_CACHE_DIR, exist_ok=True)
+			# Written to a unique temporary file first, so a partially written range is never read,
+			# and threads saving the same range do not write to the same file.
+			handle, temp_file = tempfile.mkstemp(dir=HIBP_CACHE_DIR, suffix='.tmp')
+			try:
+				with os.fdopen(handle, 'w') as f:
+					f.write('\n'.join(suffixes))
+				os.replace(temp_file, cache_file)
+			finally:
+				if os.path.exists(temp_file):
+					os.remove(temp_file)
+		except OSError:
+			pass
+
+	return suffixes
+
+
+def _sha1_hash(password):
+	return hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
+
+
+def _is_breached(password):
+	"""
+	Checks if the password was exposed in data breaches, by matching its hash suffix against the range of its hash prefix.
+	"""
+	pass_hash = _sha1_hash(password)
+	return pass_hash[5:] in _breached_suffixes(pass_hash[:5])
+
+
+def _prefetch_breached(passwords):
+	"""
+	Fetches ranges for all distinct hash prefixes of the passwords concurrently, so that the following
+	_is_breached() checks are answered from the cache.
+
+	Args:
+		passwords (list): list of password strings.
+	"""
+	prefixes = {_sha1_hash(password)[:5] for password in passwords}
+
+	if len(prefixes) > 1:
+		with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(prefixes))) as executor:
+			list(executor.map(_breached_suffixes, prefixes))
+
+
+def _to_bytes(pass_chars):
+	"""
+	Returns the password as a bytearray. A bytearray is returned as it is, while a string or a list of chars is encoded.
+
+	Args:
+		pass_chars (bytearray): bytearray, bytes, string or list of chars representing the password.
+	"""
+	if isinstance(pass_chars, bytearray):
+		return pass_chars
+
+	if isinstance(pass_chars, bytes):
+		return bytearray(pass_chars)
+
+	return bytearray(''.join(pass_chars), 'ascii')
+
+
 class PyPass:
 	"""
 	Class used for storing and generating passwords.
@@ -23,6 +146,7 @@ class PyPass:
 		"""
 		Args: 
 			usable_chars (list): list of lists containing arrays of characters to be used in password generation. 
+								 Characters must be single ASCII chars.
 								 Is not relevant in generating passwords from language model.
 			excuded_chars (list): list of characters which will not be used in password generation. 
 								  Is not relevant in generating passwords from language model.
@@ -47,17 +171,40 @@ class PyPass:
 		Usable chars are checked against the excluded characters, and any matching chars are removed before
 		initializing usable_chars property.
 		"""
-		for excl_char in excluded_chars:
-			for usable_char_list in usable_chars:
-				if excl_char in usable_char_list:
-					usable_char_list.remove(excl_char)
+		excluded_set = set(excluded_chars)
+		usable_chars = [[char for char in usable_char_list if char not in excluded_set] for usable_char_list in usable_chars]
 
 		self.usable_chars = usable_chars
+
+		# Passwords are generated as bytearrays, so each usable char needs to be a single byte.
+		if not all(isinstance(char, str) and len(char) == 1 and ord(char) < 128
+				   for char in itertools.chain.from_iterable(usable_chars)):
+			raise ValueError("Usable chars must be single ASCII characters.")
+
+		# All usable chars in a single list of byte values, weighted so that each usable_chars list is equally likely
+		# to be drawn from.
+		self._pool = [ord(char) for char in itertools.chain.from_iterable(usable_chars)]
+		self._pool_cum_weights = list(itertools.accumulate(1 / len(usable_char_list) for usable_char_list in usable_chars
+														   for char in usable_char_list))
+		self._sysrand = random.SystemRandom()
+
+		# Maps the byte value of each usable char to the indexes of all usable_chars lists containing it,
+		# used by self.generate_new_dict().
+		self._char_to_groups = {}
+		for index, usable_char_list in enumerate(usable_chars):
+			for char in usable_char_list:
+				self._char_to_groups.setdefault(ord(char), []).append(index)
 		self.excluded_words = excluded_words
+		# Excluded words are combined into a single pattern, used by self.contains_excluded().
+		# Empty words are left out, as they would match everywhere.
+		self._excl_re = re2.compile('|'.join(re.escape(w) for w in excluded_words if len(w) > 0)) \
+			if any(len(w) > 0 for w in excluded_words) else None
 
 		# Setting the minimum and maximum length of the generated passwords.
 		self.min_pass_len = min_pass_len
 		self.max_pass_len = max_pass_len
+		# All possible password lengths, from which a random one is chosen if the length is not fixed.
+		self._len_range = list(range(self.min_pass_len, self.max_pass_len + 1))
 
 		# Passwords generated with self.generate_human_password will be stored here
 		self.human_passwords = []
@@ -66,8 +213,6 @@ class PyPass:
 
 		self.language_manager = Language(library=language_lib, min_sentence_length=min_pass_len, max_sentence_length=max_pass_len, include_whitespace=include_whitespace) if language_lib is not None else None
 
-		set_user_agent(ua="PyPass Python password generator. Demo version.")
-
 
 	def __str__(self):
 		return ' '.join(self.all_passwords)
@@ -79,13 +224,13 @@ class PyPass:
 
 	def generate_random(self, pass_length):
 		"""
-		Generates a random list of chars from types available in usable_chars.
+		Generates a random bytearray of chars from types available in usable_chars.
 		
 		Args:
 			pass_length (int): length of random passwords string to be generated.
 		"""
-		
-		return [secrets.choice(self.usable_chars[self.usable_chars.index(secrets.choice(self.usable_chars))]) for e in range(pass_length)]
+		# SystemRandom draws from the OS CSPRNG, like secrets, with a single choices() call for the whole password.
+		return bytearray(self._sysrand.choices(self._pool, cum_weights=self._pool_cum_weights, k=pass_length))
 
 	def remove_touching_duplicates(self, my_string_list):
 		"""
@@ -93,18 +238,22 @@ class PyPass:
 		replacing them with random char from a randomly chosen usable_char list.
 		
 		Args:
-			my_string_list (list): list of characters.
+			my_string_list (bytearray): bytearray or list of characters. The same type is returned.
 		"""
-		new_string_list = []
-		
-		# The -1 range was chosen to avoid index out of range error.
-		for char in range(len(my_string_list[:-1])):
-			if my_string_list[char] == my_string_list[char+1]:
-				new_string_list.append(secrets.choice(self.usable_chars[self.usable_chars.index(secrets.choice(self.usable_chars))]))
-			else:
-				new_string_list.append(my_string_list[char])
+		# Positions of chars equal to the char before them are all found first, against the original list.
+		duplicates = [char for char in range(1, len(my_string_list)) if my_string_list[char] == my_string_list[char-1]]
+
+		# Replacement chars for all positions are drawn with a single generate_random() call.
+		new_chars = self.generate_random(len(duplicates))
 
-		new_string_list.append(my_string_list[-1])
+		if isinstance(my_string_list, (bytes, bytearray)):
+			new_string_list = bytearray(my_string_list)
+		else:
+			new_string_list = list(my_string_list)
+			new_chars = new_chars.decode('ascii')
+
+		for char, new_char in zip(duplicates, new_chars):
+			new_string_list[char] = new_char
 
 		return(new_string_list)
 
@@ -114,44 +263,79 @@ class PyPass:
 		"""
 		Checks if a string contains any of the words or other char sequences stored in self.excluded_words.
 		"""
-		
-		return any(word in my_string for word in self.excluded_words)
+		if self._excl_re is None:
+			return False
 
+		return bool(self._excl_re.search(my_string))
 
-	def find_letter_sequences(self, my_list):
+
+	def _replace_matches(self, pass_string, find_matches, remove_touching):
 		"""
-		Used in generate_human_password(). Finds sequences of letters in the password string. Once found, 
-		it checks if the letter sequence corresponds to an English word, or is an excluded word. If such 
-		sequences are found, they are replaced with a random set of characters.
+		Replaces each match returned by find_matches() with a new random string of the same length. The string is
+		rebuilt in a single pass over the matches, which is repeated until no more matches are found, as the new
+		random strings could also need to be replaced.
 
 		Args:
-			my_list (list): list representation of the password.
+			pass_string (bytearray): bytes representation of the password.
+			find_matches (function): takes the password bytearray, and returns the matches to be replaced, in order.
+			remove_touching (bool): Determines if touching duplicate characters will be removed from the new strings.
 		"""
+		replaced = True
+
+		while replaced:
+			replaced = False
+			new_string = bytearray()
+			last = 0
+
+			# The string is rebuilt from the positions of the matches, so every sequence is only replaced where it was found.
+			for match in find_matches(pass_string):
+				new_string += pass_string[last:match.start()]
 
-		pass_string = ''.join(my_list)
-		pattern = re.compile('[a-zA-Z]{2,}')
+				new_sequence = self.generate_random(match.end() - match.start())
+				if remove_touching:
+					new_sequence = self.remove_touching_duplicates(new_sequence)
 
+				new_string += new_sequence
+				replaced = True
+				last = match.end()
+
+			new_string += pass_string[last:]
+			pass_string = new_string
+
+		return pass_string
+
+	def _replace_letter_sequences(self, pass_string, pattern, is_replaced, remove_touching):
 		"""
-		Replaces English words with new random strings.
-		The process is repeated if the newly generated random string, is also an English word.
+		Replaces each letter sequence found with pattern, which is longer than 3 chars and for which is_replaced()
+		returns True, with a new random string of the same length, using self._replace_matches().
+
+		Args:
+			pass_string (bytearray): bytes representation of the password.
+			pattern (re.Pattern): compiled pattern used to find the letter sequences.
+			is_replaced (function): takes the match of a letter sequence, and returns True if it should be replaced.
+			remove_touching (bool): Determines if touching duplicate characters will be removed from the new strings.
 		"""
+		def find_matches(string):
+			return [match for match in pattern.finditer(string) if len(match.group()) > 3 and is_replaced(match)]
+
+		return self._replace_matches(pass_string, find_matches, remove_touching)
 
-		finds = 1
+	def find_letter_sequences(self, my_list):
+		"""
+		Used in generate_human_password(). Finds sequences of letters in the password string. Once found, 
+		it checks if the letter sequence corresponds to an English word, or is an excluded word. If such 
+		sequences are found, they are replaced with a random set of characters.
 
-		while finds == 1:
-			matches = pattern.findall(pass_string)
-			if len(matches) > 0:
-				for m in matches:
-					if (wordnet.synsets(m.lower()) or self.contains_excluded(m)) and len(m) > 3:
-						pass_string = pass_string.replace(m, self.remove_touching_duplicates(self.generate_random(len(m))))
-						finds = 1
+		Args:
+			my_list (bytearray): bytearray representation of the password.
+		"""
+		english_words = _english_words()
 
-					else:
-						finds = 0
-			else:
-				finds = 0
+		def is_replaced(match):
+			sequence = match.group().decode('ascii')
+			return sequence.lower() in english_words or self.contains_excluded(sequence)
 
-		return list(pass_string)
+		return self._replace_letter_sequences(_to_bytes(my_list), _LETTER_RUN_2, is_replaced, remove_touching=True)
 
 
 	def remove_english(self, my_string_list, remove_touching):
@@ -161,78 +345,32 @@ class PyPass:
 		they are replaced with a random set of characters.
 
 		Args:
-			my_string_list (list): list representation of the password.
+			my_string_list (bytearray): bytearray representation of the password.
 			remove_touching (bool): Determines if touching duplicate characters will be removed.
 		"""
-		pass_string = ''.join(my_string_list)
-		pattern = re.compile('[a-zA-Z]+')
-
-		"""
-		Replaces English words with new random strings.
-		The process is repeated if the newly generated random string, is also an English word.
-		"""
-
-		finds = 1
-
-		while finds == 1:
-			matches = pattern.findall(pass_string)
-			if len(matches) > 0:
-				for m in matches:
-					if wordnet.synsets(m.lower()) and len(m) > 3:
-						if remove_touching:
-							pass_string = pass_string.replace(m,
-															  self.remove_touching_duplicates(self.generate_random(len(m))))
-						else:
-							pass_string = pass_string.replace(m, self.generate_random(len(m)))
-						finds = 1
-
-					else:
-						finds = 0
-			else:
-				finds = 0
+		english_words = _english_words()
 
-		return list(pass_string)
+		return self._replace_letter_sequences(_to_bytes(my_string_list), _LETTER_RUN_1,
+											  lambda m: m.group().decode('ascii').lower() in english_words, remove_touching)
 
 
 	def remove_excluded(self, my_string_list, remove_touching):
 		"""
-		Used in generate_password(). Finds sequences of letters in the password string.	Once found, 
-		it checks if the letter sequence corresponds to an item from the excluded words list (self.excluded_words).
-		If such sequences are found, they are replaced with a random set of characters.
+		Used in generate_password(). Finds every occurrence of the items from the excluded words list (self.excluded_words)
+		in the password string, including items which contain digits or other non-letter chars, of any length.
+		Each occurrence is replaced with a random set of characters.
 		Args:
-			my_string_list (list): list representation of the password.
+			my_string_list (bytearray): bytearray representation of the password.
 			remove_touching (bool): Determines if touching duplicate characters will be removed.
 		"""
+		pass_string = _to_bytes(my_string_list)
 
-		pass_string = ''.join(my_string_list)
-		pattern = re.compile('[a-zA-Z]+')
+		if self._excl_re is None:
+			return pass_string
 
-		"""
-		Replaces English words with new random strings.
-		The process is repeated if the newly generated random string, is also an English word.
-		"""
-
-		finds = 1
-
-		while finds == 1:
-			matches = pattern.findall(pass_string)
-			if len(matches) > 0:
-				for m in matches:
-					if self.contains_excluded(pass_string) and len(m) > 3:
-						if remove_touching:
-							pass_string = pass_string.replace(m,
-															  self.remove_touching_duplicates(
-																  self.generate_random(len(m))))
-						else:
-							pass_string = pass_string.replace(m, self.generate_random(len(m)))
-						finds = 1
-
-					else:
-						finds = 0
-			else:
-				finds = 0
-
-		return list(pass_string)
+		# Passwords are ASCII, so positions in the decoded string are the same as in the bytearray.
+		return self._replace_matches(pass_string, lambda string: list(self._excl_re.finditer(string.decode('ascii'))),
+									 remove_touching)
 
 	@staticmethod
 	def confirm_proportions(list_dict):
@@ -250,39 +388,80 @@ class PyPass:
 		Generates a new dictionary reflecting the number of each char type from usable_chars in the password.
 
 		Args:
-			string_members (list): list of characthers representing the password.
+			string_members (bytearray): bytearray, string or list of characthers representing the password.
 		"""
-		return {str(self.usable_chars.index(v)): sum(ch in v for ch in string_members) for v in self.usable_chars}
+		counts = [0] * len(self.usable_chars)
+
+		for ch in _to_bytes(string_members):
+			for index in self._char_to_groups.get(ch, ()):
+				counts[index] += 1
+
+		return {str(index): count for index, count in enumerate(counts)}
 
 	def ensure_proportions(self, string_members):
 		"""
 		Checks if there is at least one of each types of usable_chars in the password string using the confirm_proportions().
-		If the proportion is not fulfilled, it replaces a random character in the password string, with a randomly chosen
-		char from the missing usable_chars type. It continues this check until the confirm_proportions() returns True.
+		If the proportion is not fulfilled, it replaces a random character in the password string for each missing usable_chars
+		type, with a randomly chosen char of that type. It continues this check until the confirm_proportions() returns True.
 		Does not check for enforcing exclusion of English words or consecutive chars, because this function will insert only
 		a single character from a list, from which not a single member is contained in the generated password. It will check
 		for excluded words, since these might be a sequence of different types of chars.
 
+		Raises ValueError if the password is shorter than the number of non-empty usable_chars lists.
+
 		Args:
-			string_members (list): list of characthers representing the password.
+			string_members (bytearray): bytearray representation of the password.
 		"""
+		string_members = _to_bytes(string_members)
+
+		# Without enough chars for one of each type, the proportions could never be fulfilled.
+		types_number = sum(1 for usable_char_list in self.usable_chars if len(usable_char_list) > 0)
+		if len(string_members) < types_number:
+			raise ValueError(f"Password of length {len(string_members)} cannot contain one of each of the "
+							 f"{types_number} types of usable chars.")
+
 		string_proportions = self.generate_new_dict(string_members)
 
 		while not self.confirm_proportions(string_proportions):
-			for item in string_proportions.keys():
+			missing = [int(item) for item, type_freq in string_proportions.items() if type_freq < 1]
 
-				if string_proportions[item] < 1:
-					index = secrets.choice(list(range(len(string_members))))
-					string_members[index] = secrets.choice(self.usable_chars[int(item)])
+			# One char of each missing type is placed at a distinct random position, all in a single pass.
+			positions = self._sysrand.sample(range(len(string_members)), k=len(missing))
+			for item, index in zip(missing, positions):
+				string_members[index] = ord(secrets.choice(self.usable_chars[item]))
 
-					# If excluded words are defined, the function will remove any contained in the new password.
-					if len(self.excluded_words) > 0:
-						string_members = self.remove_excluded(string_members, remove_touching=False)
+			# If excluded words are defined, the function will remove any contained in the new password.
+			if len(self.excluded_words) > 0:
+				string_members = self.remove_excluded(string_members, remove_touching=False)
 
-				string_proportions = self.generate_new_dict(string_members)
+			# A replaced char could have been the only one of its type, so the proportions are checked again.
+			string_proportions = self.generate_new_dict(string_members)
 
 		return string_members
 
+	@staticmethod
+	def _generate_unbreached(generate_one):
+		# Returns a password made by generate_one(), or None if it was exposed in data breaches.
+		my_pass = generate_one()
+
+		return None if _is_breached(my_pass) else my_pass
+
+	def _generate_concurrently(self, generate_one, pass_number):
+		"""
+		Generates pass_number passwords with generate_one() in a thread pool, and checks each of them against the
+		breached passwords in the same thread, so the requests for their hash ranges are made concurrently.
+		Returns the passwords which were not breached, in the order they were completed.
+
+		Args:
+			generate_one (function): takes no args, and returns a new password string.
+			pass_number (int): number of passwords to be generated.
+		"""
+		with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, pass_number)) as executor:
+			futures = [executor.submit(self._generate_unbreached, generate_one) for number in range(pass_number)]
+
+			# Results are collected in this thread only, so the password lists need no lock.
+			return [my_pass for my_pass in (future.result() for future in as_completed(futures)) if my_pass is not None]
+
 	def generate_human_password(self, pass_number=PSWRD_NO, fixed_len=FIXED_LEN):
 		"""
 		The function will generate a password conforming to most common rules recommended for passwords generation. 
@@ -315,29 +494,37 @@ class PyPass:
 		if pass_number < 1:
 			pass_number = 1
 
-		for number in range(pass_number):
+		# WordNet is loaded in this thread before any worker threads need it, as its first load is not thread-safe.
+		_english_words()
 
-			if fixed_len:
-				pass_string_list = self.generate_random(fixed_len)
+		target = len(self.human_passwords) + pass_number
 
-			else:
-				pass_len_range = list(range(self.min_pass_len,self.max_pass_len+1))
-				pass_string_list = self.generate_random(secrets.choice(pass_len_range))
+		# Breached passwords are discarded, and only the missing number of passwords is generated again.
+		while len(self.human_passwords) < target:
+			self.human_passwords.extend(self._generate_concurrently(lambda: self._generate_one_human(fixed_len),
+																	target - len(self.human_passwords)))
 
+	def _generate_one_human(self, fixed_len=FIXED_LEN):
+		"""
+		Generates a single password string following the rules of generate_human_password(), without checking it
+		against the breached passwords.
+
+		Args:
+			fixed_len (int): Determines if password needs to be of a designated fixed length.
+		"""
+		if fixed_len:
+			pass_string_list = self.generate_random(fixed_len)
 
-			# Removing touching duplicate chars.
-			my_pass = self.find_letter_sequences(self.remove_touching_duplicates(pass_string_list))
+		else:
+			pass_string_list = self.generate_random(secrets.choice(self._len_range))
 
-			# Ensuring at least one member of each type from usable_chars is contained in the password string.
-			my_pass = self.ensure_proportions(my_pass)
+		# Removing touching duplicate chars.
+		my_pass = self.find_letter_sequences(self.remove_touching_duplicates(pass_string_list))
 
-			my_pass = ''.join(my_pass)
+		# Ensuring at least one member of each type from usable_chars is contained in the password string.
+		my_pass = self.ensure_proportions(my_pass)
 
-			# Checking if the generated password was exposed in data breaches. If so, the process is repeated.
-			if pw.is_password_breached(password=my_pass) != 0:
-				self.generate_password()
-			else:
-				self.human_passwords.append(my_pass)
+		return my_pass.decode('ascii')
 
 
 	def generate_password(self, pass_number=PSWRD_NO, remove_repeating=False, remove_english=False, check_proportions=False,
@@ -362,51 +549,74 @@ class PyPass:
 		if pass_number<1:
 			pass_number = 1
 
-		for number in range(pass_number):
-			if fixed_len:
-				pass_string_list = self.generate_random(fixed_len)
+		# The rules chosen by the user are resolved once into a list of steps, which is the same for every password.
+		steps = []
 
-			else:
-				pass_len_range = list(range(self.min_pass_len,self.max_pass_len+1))
-				pass_string_list = self.generate_random(secrets.choice(pass_len_range))
+		# Removing touching duplicate chars, in case the user chose so.
+		if remove_repeating:
+			steps.append(self.remove_touching_duplicates)
 
-			# Removing touching duplicate chars, in case the user chose so.
-			if remove_repeating:
-				pass_string_list = self.remove_touching_duplicates(pass_string_list)
+		# Removing English words and excluded words, if the user chose so.
+		if remove_english:
+			# WordNet is loaded in this thread before any worker threads need it, as its first load is not thread-safe.
+			_english_words()
+			steps.append(lambda pass_string_list: self.remove_english(pass_string_list, remove_repeating))
 
-			# Removing English words and excluded words, if the user chose so.
-			if remove_english:
-				pass_string_list = self.remove_english(pass_string_list,remove_repeating)
+		# Removing excluded words, if they are designated by the user.
+		if len(self.excluded_words) > 0:
+			steps.append(lambda pass_string_list: self.remove_excluded(pass_string_list, remove_repeating))
 
-			# Removing excluded words, if they are designated by the user.
-			if len(self.excluded_words) > 0:
-				pass_string_list = self.remove_excluded(pass_string_list, remove_repeating)
+		# If the user chose so, ensuring at least one member of each group of characters
+		# from the usable characters lists has been included.
+		if check_proportions:
+			steps.append(self.ensure_proportions)
+
+		if fixed_len:
+			pass_len = lambda: fixed_len
+		else:
+			pass_len = lambda: secrets.choice(self._len_range)
+
+		target = len(self.passwords) + pass_number
+
+		# Breached passwords are discarded, and only the missing number of passwords is generated again.
+		while len(self.passwords) < target:
+			self.passwords.extend(self._generate_concurrently(lambda: self._generate_one(pass_len(), steps),
+															  target - len(self.passwords)))
 
-			# If the user chose so, ensuring at least one member of each group of characters
-			# from the usable characters lists has been included.
-			if check_proportions:
-				pass_string_list = self.ensure_proportions(pass_string_list)
+	def _generate_one(self, pass_length, steps):
+		"""
+		Generates a single password string for generate_password(), without checking it against the breached passwords.
+
+		Args:
+			pass_length (int): length of the password to be generated.
+			steps (list): functions applied in order to the bytearray of the password, each returning a bytearray.
+		"""
+		pass_string_list = self.generate_random(pass_length)
 
-			my_pass = ''.join(pass_string_list)
+		for step in steps:
+			pass_string_list = step(pass_string_list)
 
-			if pw.is_password_breached(password=my_pass) != 0:
-				self.generate_password(pass_number=pass_number, remove_repeating=remove_repeating,
-									   remove_english=remove_english, ensure_proportions=check_proportions)
-			else:
-				self.passwords.append(my_pass)
+		return pass_string_list.decode('ascii')
 
 	def generate_sentence_pass(self, pass_number=PSWRD_NO):
 		"""
 		Function will generate passwords in form of random sentences, generated using one of the custom stored or nltk trigram models
-		Generated passwords are appended to self.passwords.
+		Generated passwords are appended to self.passwords. At most pass_number * 10 sentences are generated, so fewer
+		passwords than pass_number may be appended if most of them were exposed in data breaches.
 
         Args:
 			pass_number (int): Designates how many passwords are to be created. If left blank, will generate one password.		
 		"""
-		for number in range(pass_number):
-			my_pass = self.language_manager.form_sentece()
-			if pw.is_password_breached(password=my_pass) != 0:
-				self.generate_sentence_pass(pass_number=pass_number)
-			else:
-				self.passwords.append(my_pass)
+		target = len(self.passwords) + pass_number
+		attempts = 0
+
+		# Breached sentences are discarded, and only the missing number of sentences is generated again.
+		# The number of generated sentences is limited, as a small language model might keep repeating breached ones.
+		while len(self.passwords) < target and attempts < pass_number * 10:
+			candidates = [self.language_manager.form_sentece() for number in range(target - len(self.passwords))]
+			attempts += len(candidates)
+
+			# Breached password ranges for all candidates are fetched at once.
+			_prefetch_breached(candidates)
 
+			self.passwords.extend(my_pass for my_pass in candidates if not _is_breached(my_pass))
@@ -36,3 +36,12 @@ TEMPLATE_DIR = os.path.join(ROOT_DIR, 'templates')
 MODEL_DIR = os.path.join(ROOT_DIR, 'models')
 
 MIN_SENT_LENGTH = 10
+
+# Optional directory where ranges of breached password hashes downloaded from 'https://haveibeenpwned.com/Passwords'
+# are saved, to be reused for HIBP_CACHE_DAYS days. Disabled (None) by default, as it leaves a trace of every generated
+# password: each range is saved as a file named after the first 5 chars of the password's SHA-1 hash, and the time the
+# file was changed is the time the password was generated. Enable only if that is acceptable,
+# e.g. HIBP_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'pypass', 'hibp')
+HIBP_CACHE_DIR = None
+
+HIBP_CACHE_DAYS = 1
@@ -1,13 +1,18 @@
 import unittest
 import itertools
 import os
+import threading
+import tempfile
+import time
+from unittest import mock
 
 import nltk
 
+import password
 from password import PyPass
 from language import ModelManager, Language
 from text_for_testing import TEST_TEXT
-from settings import MODEL_DIR, TEMPLATE_DIR
+from settings import MODEL_DIR, TEMPLATE_DIR, USABLE_CHARS
 
 class TestPassword(unittest.TestCase):
 
@@ -63,6 +68,35 @@ class TestPassword(unittest.TestCase):
 	Defining testing functions
 	"""
 
+	def reject_first(self, rejected_number):
+		"""
+		Returns a replacement for password._is_breached, which reports the first rejected_number passwords
+		as breached, and keeps the number of checked passwords in self.checked_number.
+		"""
+		self.checked_number = 0
+		lock = threading.Lock()
+
+		def is_breached(password):
+			with lock:
+				self.checked_number += 1
+				return self.checked_number <= rejected_number
+
+		return is_breached
+
+	def search_suffixes(self, hash_prefix=None):
+		# Replacement for pw.suffix_search, which keeps the number of range requests in self.searched_number.
+		self.searched_number += 1
+		return ['0' * 35 + ':3', '1' * 35 + ':5']
+
+	def breached_suffixes(self, cache_dir):
+		# Looks up a range with HIBP_CACHE_DIR set to cache_dir, bypassing the in-memory cache.
+		password._breached_suffixes.cache_clear()
+		with mock.patch('password.HIBP_CACHE_DIR', cache_dir), \
+			 mock.patch('password.pw.suffix_search', self.search_suffixes):
+			suffixes = password._breached_suffixes('ABCDE')
+		password._breached_suffixes.cache_clear()
+		return suffixes
+
 	def has_touching_duplicates(self,test_str):
 		for char in range(len(test_str[-1])):
 			if test_str[char] == test_str[char+1]:
@@ -107,6 +141,12 @@ class TestPassword(unittest.TestCase):
 		self.assertFalse(self.has_touching_duplicates(self.p4.remove_touching_duplicates([0,0,0,0,6,5,6,4,5,5,4,'m',\
 																'm','m','m','s','s','s','?','?','?','?','Q','Q','Q',])))
 
+	def test_remove_touching_duplicates_bytearray(self):
+		new_pass = self.p1.remove_touching_duplicates(bytearray(b'aaaaaa'))
+		self.assertIsInstance(new_pass, bytearray)
+		self.assertEqual(len(new_pass), 6)
+		self.assertTrue(all(new_pass[i] != ord('a') for i in range(1, 6)))
+
 	"""
 	Testing confirm_proportions()
 	"""
@@ -117,6 +157,16 @@ class TestPassword(unittest.TestCase):
 		self.assertTrue(self.p3.confirm_proportions(self.my_dict3))
 		self.assertTrue(self.p4.confirm_proportions(self.my_dict4))
 
+	"""
+	Testing generate_new_dict()
+	"""
+
+	def test_generate_new_dict_input_types(self):
+		expected = {'0': 2, '1': 1, '2': 1, '3': 2}
+		self.assertEqual(self.p1.generate_new_dict('xAc1!!'), expected)
+		self.assertEqual(self.p1.generate_new_dict(bytearray(b'xAc1!!')), expected)
+		self.assertEqual(self.p1.generate_new_dict(list('xAc1!!')), expected)
+
 	"""
 	Testing removal of excluded_characters from usable_chars lists.
 	"""
@@ -127,6 +177,126 @@ class TestPassword(unittest.TestCase):
 		self.assertFalse(self.hmp3.excluded_chars in self.join_l(self.hmp3.usable_chars))
 		self.assertFalse(self.hmp4.excluded_chars in self.join_l(self.hmp4.usable_chars))
 
+	def test_usable_chars_default_unmodified(self):
+		usable_chars = [list(usable_char_list) for usable_char_list in USABLE_CHARS]
+		PyPass(excluded_chars=['g', 'Q', '5', '?'])
+		self.assertEqual(USABLE_CHARS, usable_chars)
+		self.assertTrue('g' in USABLE_CHARS[0])
+
+	"""
+	Testing the cache of breached password ranges.
+	"""
+
+	def test_breached_suffixes_cache_file(self):
+		self.searched_number = 0
+		expected = frozenset(['0' * 35, '1' * 35])
+		with tempfile.TemporaryDirectory() as cache_dir:
+			self.assertEqual(self.breached_suffixes(cache_dir), expected)
+			self.assertEqual(os.listdir(cache_dir), ['ABCDE.txt'])
+			self.assertEqual(self.breached_suffixes(cache_dir), expected)
+			self.assertEqual(self.searched_number, 1)
+
+	def test_breached_suffixes_expired_cache_file(self):
+		self.searched_number = 0
+		with tempfile.TemporaryDirectory() as cache_dir:
+			self.breached_suffixes(cache_dir)
+			expired = time.time() - (password.HIBP_CACHE_DAYS + 1) * 86400
+			os.utime(os.path.join(cache_dir, 'ABCDE.txt'), (expired, expired))
+			self.assertEqual(self.breached_suffixes(cache_dir), frozenset(['0' * 35, '1' * 35]))
+			self.assertEqual(self.searched_number, 2)
+			self.assertTrue(os.path.getmtime(os.path.join(cache_dir, 'ABCDE.txt')) > expired)
+
+	def test_breached_suffixes_cache_dir_is_file(self):
+		self.searched_number = 0
+		with tempfile.TemporaryDirectory() as cache_dir:
+			not_a_dir = os.path.join(cache_dir, 'pypass')
+			open(not_a_dir, 'w').close()
+			self.assertEqual(self.breached_suffixes(os.path.join(not_a_dir, 'hibp')), frozenset(['0' * 35, '1' * 35]))
+			self.assertEqual(self.breached_suffixes(not_a_dir), frozenset(['0' * 35, '1' * 35]))
+			self.assertEqual(self.searched_number, 2)
+			self.assertEqual(os.listdir(cache_dir), ['pypass'])
+
+	"""
+	Testing ensure_proportions()
+	"""
+
+	def test_ensure_proportions_too_short(self):
+		self.assertRaises(ValueError, self.p1.ensure_proportions, bytearray(b'ab'))
+		self.assertRaises(ValueError, PyPass(min_pass_len=2, max_pass_len=2).generate_password, check_proportions=True)
+		self.assertRaises(ValueError, PyPass(min_pass_len=0, max_pass_len=0).generate_password, check_proportions=True)
+
+	def test_ensure_proportions_fills_missing_types(self):
+		new_pass = self.p1.ensure_proportions(bytearray(b'xyzw'))
+		self.assertTrue(self.p1.confirm_proportions(self.p1.generate_new_dict(new_pass)))
+
+	"""
+	Testing find_letter_sequences()
+	"""
+
+	def test_find_letter_sequences_replaces_excluded(self):
+		p = PyPass(excluded_words=['qwerty'])
+		new_pass = p.find_letter_sequences(list('1qwertyx!'))
+		self.assertFalse(p.contains_excluded(new_pass.decode('ascii')))
+		self.assertEqual(len(new_pass), 9)
+
+	"""
+	Testing remove_excluded()
+	"""
+
+	def test_remove_excluded_inside_letter_sequence(self):
+		p = PyPass(excluded_words=['password'])
+		new_pass = p.remove_excluded(bytearray(b'1Xpasswordz!'), False)
+		self.assertFalse(p.contains_excluded(new_pass.decode('ascii')))
+		self.assertEqual(len(new_pass), 12)
+		self.assertEqual(new_pass[:1] + new_pass[-1:], b'1!')
+
+	def test_remove_excluded_with_digits(self):
+		p = PyPass()
+		for excluded_word in ['123456', '1q2w3e4r', '18atcskd2w', '123qwe']:
+			new_pass = p.remove_excluded(bytearray(f'X{excluded_word}!'.encode('ascii')), False)
+			self.assertFalse(p.contains_excluded(new_pass.decode('ascii')))
+			self.assertEqual(len(new_pass), len(excluded_word) + 2)
+
+	def test_remove_excluded_matches_contains_excluded(self):
+		p = PyPass(excluded_words=['password'])
+		self.assertFalse(p.contains_excluded('1XPASSWORDz!'))
+		self.assertEqual(p.remove_excluded(bytearray(b'1XPASSWORDz!'), False), b'1XPASSWORDz!')
+
+	"""
+	Testing retrying of breached passwords.
+	"""
+
+	def test_generate_password_replaces_only_breached(self):
+		p = PyPass()
+		with mock.patch('password._is_breached', self.reject_first(3)):
+			p.generate_password(pass_number=5, remove_repeating=True, check_proportions=True)
+		self.assertEqual(len(p.passwords), 5)
+		self.assertEqual(self.checked_number, 8)
+
+	def test_generate_human_password_replaces_only_breached(self):
+		p = PyPass()
+		with mock.patch('password._is_breached', self.reject_first(2)):
+			p.generate_human_password(pass_number=4)
+		self.assertEqual(len(p.human_passwords), 4)
+		self.assertEqual(len(p.passwords), 0)
+		self.assertEqual(self.checked_number, 6)
+
+	def test_generate_sentence_pass_replaces_only_breached(self):
+		p = PyPass()
+		p.language_manager = mock.Mock(**{'form_sentece.return_value': 'sing to me of the man muse'})
+		with mock.patch('password._is_breached', self.reject_first(1)):
+			p.generate_sentence_pass(pass_number=3)
+		self.assertEqual(len(p.passwords), 3)
+		self.assertEqual(p.language_manager.form_sentece.call_count, 4)
+
+	def test_generate_sentence_pass_limits_attempts(self):
+		p = PyPass()
+		p.language_manager = mock.Mock(**{'form_sentece.return_value': 'sing to me of the man muse'})
+		with mock.patch('password._is_breached', return_value=True):
+			p.generate_sentence_pass(pass_number=3)
+		self.assertEqual(p.language_manager.form_sentece.call_count, 30)
+		self.assertEqual(p.passwords, [])
+
 	def test_save_and_delete_model(self):
 		model_name = 'odyssey'
 		m = ModelManager(model_name)